@@ -1,13 +1,9 @@
 #!/usr/bin/env python3
 import logging
 import pandas
-from tqdm import tqdm
-from transform_directory_anotations import transform_directory_annotations
-from create_directory_annotations import create_directory_annotations
-from pathlib import Path
 import os
 import json
-from iiif_prezi3 import Manifest, config, AnnotationPage, Annotation, ExternalItem, ServiceItem1, Collection, ResourceItem, Metadata, KeyValueString
+from iiif_prezi3 import Manifest, config, Collection, ResourceItem, KeyValueString
 
 # create logger
 logger = logging.getLogger('create catalog')
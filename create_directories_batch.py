@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 import logging
 import pandas
-from tqdm import tqdm
 from transform_directory_anotations import transform_directory_annotations
 from create_directory_annotations import create_directory_annotations
 from pathlib import Path
@@ -26,6 +25,8 @@ logger.addHandler(ch)
 
 only_transform = False
 force_iiif_creation = False
+# height (in canvas pixels) of the annotation bands, 0 for a single annotation page per view
+band_height = 0
 df = pandas.read_excel(r"directories_adress_lists_index_20230915.xlsx")
 # filter the directories that have been processed
 processed = df[df['selection_trait_soduco']>0]
@@ -70,11 +71,11 @@ for ouvrage in ouvrages:
                                               input_transform_manifest_path=Path(input_transform_manifest_path),
                                               output_transform_manifest_path=Path(output_transform_manifest_path))
               if not only_transform:
-                create_directory_annotations(label=liste_nom_original,directory_file_name=code_fichier,ark=ark,diff_vuepdf_vueark=int(diff_vuepdf_vueark),npage_pdf_d=npage_pdf_d,npage_pdf_f=npage_pdf_f,directory_path=Path(output_path),output=Path(iiif_output_path))
+                create_directory_annotations(label=liste_nom_original,directory_file_name=code_fichier,ark=ark,diff_vuepdf_vueark=int(diff_vuepdf_vueark),npage_pdf_d=npage_pdf_d,npage_pdf_f=npage_pdf_f,directory_path=Path(output_path),output=Path(iiif_output_path),band_height=band_height)
             else:
               logger.debug(f"\tIgnoring tranformation for {code_fichier}: alreading processed in {output_path}")
               if (not os.path.exists(iiif_output_path) or force_iiif_creation) and not only_transform:
-                create_directory_annotations(label=liste_nom_original,directory_file_name=code_fichier,ark=ark,diff_vuepdf_vueark=int(diff_vuepdf_vueark),npage_pdf_d=npage_pdf_d,npage_pdf_f=npage_pdf_f,directory_path=Path(output_path),output=Path(iiif_output_path))
+                create_directory_annotations(label=liste_nom_original,directory_file_name=code_fichier,ark=ark,diff_vuepdf_vueark=int(diff_vuepdf_vueark),npage_pdf_d=npage_pdf_d,npage_pdf_f=npage_pdf_f,directory_path=Path(output_path),output=Path(iiif_output_path),band_height=band_height)
               else:
                 logger.debug(f"\tIgnoring annotation creation for {code_fichier}: alreading processed in iiif/{ark}")
           else:
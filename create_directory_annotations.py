@@ -2,15 +2,21 @@
 
 import logging
 import json
-from iiif_prezi3 import Manifest, config, AnnotationPage, Annotation, ExternalItem, ServiceItem1
 import os
+import math
 import argparse
 import pathlib
-import requests
-from tqdm import tqdm
 logging.basicConfig(level=logging.INFO)
 
 export_csv = False
+# profile of the per-canvas index of the annotation bands (see Readme.md)
+bands_profile = "https://directory.geohistoricaldata.org/profiles/annotation-bands"
+
+def _band_height(value:str):
+  band_height = int(value)
+  if band_height < 0:
+    raise argparse.ArgumentTypeError(f"band height must be positive or 0, got {band_height}")
+  return band_height
 
 # FIXME the ark parameter only works for gallica/BnF: find parameters that work for other providers
 def _get_parser():
@@ -23,7 +29,10 @@ def _get_parser():
   parser.add_argument("ark",type=str,help="Ark of the directory")
   parser.add_argument("input_json",type=pathlib.Path,help="Path to the input json annotations")
   parser.add_argument("diff",type=int,help="Difference between pdf view and ark view")
+  parser.add_argument("npage_pdf_d",type=int,help="First pdf view of the directory")
+  parser.add_argument("npage_pdf_f",type=int,help="Last pdf view of the directory")
   parser.add_argument("output",type=str,help="Path to the output IIIF annotations")
+  parser.add_argument("--band_height",type=_band_height,default=0,help="Split the annotations of each page into horizontal bands of this height (in canvas pixels), 0 to keep a single annotation page")
   return parser
 
 def create_target(canvasid:str, box_types):
@@ -82,8 +91,23 @@ def getBoxFromSpan(input_text:str,entries):
     if entry_index > 0:
       return boxes, entry_index
   return None
+def getBand(box, band_height:int, height:int):
+  # the band of an annotation is the one containing the vertical center of its box
+  band = int((box[1] + box[3] / 2) // band_height)
+  return min(max(band, 0), (height - 1) // band_height)
+def getBandRegion(band:int, band_height:int, boxes, width:int, height:int):
+  # the region of a band is extended to the boxes assigned to it so that entries crossing a band boundary
+  # are found in every band whose region they overlap
+  top = min([band * band_height] + [box[1] for box in boxes])
+  bottom = max([(band + 1) * band_height] + [box[1] + box[3] for box in boxes])
+  top, bottom = max(int(top), 0), min(math.ceil(bottom), height)
+  return 0, top, width, bottom - top
 local = False
-def create_directory_annotations(label:str,directory_file_name:str,ark:str,diff_vuepdf_vueark:int,npage_pdf_d:int,npage_pdf_f:int,directory_path:pathlib.Path,output:str):
+def create_directory_annotations(label:str,directory_file_name:str,ark:str,diff_vuepdf_vueark:int,npage_pdf_d:int,npage_pdf_f:int,directory_path:pathlib.Path,output:str,band_height:int=0):
+  # heavy dependencies are imported here so that --help and imports from other scripts stay fast
+  from iiif_prezi3 import Manifest, config, AnnotationPage, Annotation, ExternalItem, ServiceItem1
+  import requests
+  from tqdm import tqdm
   #print(output)
   os.makedirs(output, exist_ok=True)
   # prefix is useful for local testing
@@ -150,6 +174,8 @@ def create_directory_annotations(label:str,directory_file_name:str,ark:str,diff_
         anno_page_embedded = AnnotationPage(id=f"{prefix}/{output}/p{ark_view}.json")
         anno_page_referenced = AnnotationPage(id=f"{prefix}/{output}/p{ark_view}.json")
         canvas.annotations = [anno_page_embedded]
+        # annotations of each band when band_height is set (band index -> annotations)
+        band_annotations = {}
         transcript = []
         with open(os.path.join(directory_path, file_path)) as file:
           data = json.load(file)
@@ -202,13 +228,21 @@ def create_directory_annotations(label:str,directory_file_name:str,ark:str,diff_
                   for box in ent_box:
                     box_types.append((box,ent_label))
                   last_child += res_index
+              if band_height > 0:
+                band = getBand(new_box, band_height, height)
+                anno_page_id = f"{prefix}/{output}/p{ark_view}-b{band}.json"
+              else:
+                anno_page_id = f"{prefix}/{output}/p{ark_view}"
               anno = Annotation(
                 id=f"{prefix}/{output}/p{ark_view}-tag-{id}",
                 motivation="tagging",
                 body={"type": "TextualBody","language": "fr","format": "text/plain","value": text},
                 target=create_target(canvas.id,box_types),
-                anno_page_id=f"{prefix}/{output}/p{ark_view}")
-              anno_page_referenced.add_item(anno)
+                anno_page_id=anno_page_id)
+              if band_height > 0:
+                band_annotations.setdefault(band, []).append((anno, new_box))
+              else:
+                anno_page_referenced.add_item(anno)
               def stringify(txt:str):
                 if len(txt) > 0:
                   return "\""+txt+"\""
@@ -226,9 +260,37 @@ def create_directory_annotations(label:str,directory_file_name:str,ark:str,diff_
               #print(f"no ents for entry {id}")
               if text:
                 transcript.append((directory_file_name,str(ark_view),text,"","","","","",""))
-        json_canvas = json.loads(anno_page_referenced.json())
-        with open(os.path.join(output, f"p{ark_view}.json"), 'w') as output_file:
-          json.dump(json_canvas, output_file, indent = 1)
+        if band_height > 0 and band_annotations:
+          # one referenced annotation page per band (top to bottom) and a small index giving the region of each page
+          canvas.annotations = []
+          bands = []
+          for band in sorted(band_annotations):
+            band_page_id = f"{prefix}/{output}/p{ark_view}-b{band}.json"
+            canvas.annotations.append(AnnotationPage(id=band_page_id))
+            band_page = AnnotationPage(id=band_page_id)
+            for anno, _ in band_annotations[band]:
+              band_page.add_item(anno)
+            with open(os.path.join(output, f"p{ark_view}-b{band}.json"), 'w') as output_file:
+              json.dump(json.loads(band_page.json()), output_file, indent = 1)
+            x, y, w, h = getBandRegion(band, band_height, [box for _, box in band_annotations[band]], width, height)
+            bands.append({
+              "id": band_page_id,
+              "type": "AnnotationPage",
+              "target": f"{canvas.id}#xywh={x},{y},{w},{h}",
+              "count": len(band_annotations[band])
+            })
+          index_id = f"{prefix}/{output}/p{ark_view}-index.json"
+          with open(os.path.join(output, f"p{ark_view}-index.json"), 'w') as output_file:
+            json.dump({"id": index_id, "profile": bands_profile, "canvas": canvas.id, "band_height": band_height, "bands": bands}, output_file, indent = 1)
+          canvas.seeAlso = [ExternalItem(id=index_id, type="Dataset", label="Annotation bands", format="application/json", profile=bands_profile)]
+          # remove the single annotation page of a previous run without bands
+          if os.path.isfile(os.path.join(output, f"p{ark_view}.json")):
+            os.remove(os.path.join(output, f"p{ark_view}.json"))
+        else:
+          # single annotation page (also used in band mode when the view has no annotation)
+          json_canvas = json.loads(anno_page_referenced.json())
+          with open(os.path.join(output, f"p{ark_view}.json"), 'w') as output_file:
+            json.dump(json_canvas, output_file, indent = 1)
         # Adding the rendering if there is any on the page
         if len(transcript) > 0:
           if export_csv:
@@ -268,5 +330,8 @@ if __name__ == '__main__':
   ark = vargs.pop("ark")
   diff_vuepdf_vueark = vargs.pop("diff")
   directory_path = vargs.pop("input_json")
+  npage_pdf_d = vargs.pop("npage_pdf_d")
+  npage_pdf_f = vargs.pop("npage_pdf_f")
   output = vargs.pop("output")
-  create_directory_annotations(label,directory_file_name,ark,diff_vuepdf_vueark,directory_path,output)
\ No newline at end of file
+  band_height = vargs.pop("band_height")
+  create_directory_annotations(label,directory_file_name,ark,diff_vuepdf_vueark,npage_pdf_d,npage_pdf_f,directory_path,output,band_height=band_height)
\ No newline at end of file
@@ -0,0 +1,33 @@
+import pytest
+
+from create_directory_annotations import _get_parser, getBand, getBandRegion
+
+def test_band_of_box_center():
+  assert getBand((0, 50, 10, 20), 100, 1000) == 0
+  # the center (y=110) is in the second band even though the box starts in the first one
+  assert getBand((0, 90, 10, 40), 100, 1000) == 1
+
+def test_band_clamped_to_canvas():
+  assert getBand((0, -30, 10, 10), 100, 1000) == 0
+  assert getBand((0, 990, 10, 200), 100, 1000) == 9
+  # last (short) band of a canvas whose height is not a multiple of the band height
+  assert getBand((0, 1040, 10, 10), 100, 1050) == 10
+
+def test_band_region():
+  assert getBandRegion(2, 100, [(0, 210, 10, 20)], 800, 1000) == (0, 200, 800, 100)
+
+def test_band_region_extended_to_boxes():
+  # an entry crossing the band boundaries extends the region of its band
+  assert getBandRegion(1, 100, [(0, 90.5, 10, 40), (0, 150, 10, 60.2)], 800, 1000) == (0, 90, 800, 121)
+
+def test_last_band_region_clamped():
+  assert getBandRegion(10, 100, [(0, 1040, 10, 30)], 800, 1050) == (0, 1000, 800, 50)
+
+def test_band_height_defaults_to_single_page():
+  args = _get_parser().parse_args(["L", "D", "ark:/x", "/tmp", "0", "1", "2", "/tmp/out"])
+  assert args.band_height == 0
+  assert (args.npage_pdf_d, args.npage_pdf_f) == (1, 2)
+
+def test_negative_band_height_rejected():
+  with pytest.raises(SystemExit):
+    _get_parser().parse_args(["L", "D", "ark:/x", "/tmp", "0", "1", "2", "/tmp/out", "--band_height", "-1"])
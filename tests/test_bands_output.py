@@ -0,0 +1,71 @@
+import json
+import types
+
+import pytest
+
+iiif_prezi3 = pytest.importorskip("iiif_prezi3")
+requests = pytest.importorskip("requests")
+pytest.importorskip("tqdm")
+
+from create_directory_annotations import create_directory_annotations
+
+ARK = "ark:/12148/test"
+PREFIX = "https://directory.geohistoricaldata.org"
+
+def _entry(id:int, box, ents):
+  return {"id": id, "type": "ENTRY", "box": box, "text_ocr": f"entry {id}", "ner_xml": "", "children": [],
+          "ents": [{"label": "PER", "text": ent} for ent in ents]}
+
+@pytest.fixture
+def directory(tmp_path, monkeypatch):
+  original_manifest = {"sequences": [{"canvases": [
+    {"@id": f"https://gallica.bnf.fr/iiif/{ARK}/canvas/f{view}", "height": 1000, "width": 800} for view in (1, 2)]}]}
+  response = types.SimpleNamespace(ok=True, text=json.dumps(original_manifest))
+  monkeypatch.setattr(requests, "get", lambda url: response)
+  input_path = tmp_path / "input"
+  input_path.mkdir()
+  # view 1: one entry per band, the second one crossing the boundary between the first two bands
+  with open(input_path / "0001.json", "w") as file:
+    json.dump([_entry(3, [10, 850, 100, 100], ["Martin"]),
+               _entry(1, [10, 20, 100, 30], ["Dupont"]),
+               _entry(2, [10, 380, 100, 40], ["Durand"])], file)
+  # view 2: no entry with entities
+  with open(input_path / "0002.json", "w") as file:
+    json.dump([_entry(4, [10, 20, 100, 30], [])], file)
+  output = tmp_path / "output"
+  output.mkdir()
+  # single annotation page left by a previous run without bands
+  (output / "p1.json").write_text("{}")
+  create_directory_annotations("label", "directory", ARK, 0, 1, 2, input_path, str(output), band_height=400)
+  return output
+
+def test_band_pages(directory):
+  assert not (directory / "p1.json").exists()
+  for band, entry in enumerate([1, 2, 3]):
+    with open(directory / f"p1-b{band}.json") as file:
+      page = json.load(file)
+    assert page["id"] == f"{PREFIX}/{directory}/p1-b{band}.json"
+    assert [item["id"] for item in page["items"]] == [f"{PREFIX}/{directory}/p1-tag-{entry}"]
+
+def test_band_index(directory):
+  with open(directory / "p1-index.json") as file:
+    index = json.load(file)
+  canvas_id = f"https://gallica.bnf.fr/iiif/{ARK}/p1"
+  assert index["canvas"] == canvas_id
+  assert [band["target"] for band in index["bands"]] == [
+    f"{canvas_id}#xywh=0,0,800,400",
+    f"{canvas_id}#xywh=0,380,800,420",
+    f"{canvas_id}#xywh=0,800,800,200"]
+
+def test_manifest(directory):
+  with open(directory / "manifest.json") as file:
+    manifest = json.load(file)
+  canvas, empty_canvas = manifest["items"]
+  assert [page["id"] for page in canvas["annotations"]] == [f"{PREFIX}/{directory}/p1-b{band}.json" for band in range(3)]
+  assert all("items" not in page for page in canvas["annotations"])
+  assert canvas["seeAlso"][0]["id"] == f"{PREFIX}/{directory}/p1-index.json"
+  # a view without annotation keeps a single annotation page and no index
+  assert [page["id"] for page in empty_canvas["annotations"]] == [f"{PREFIX}/{directory}/p2.json"]
+  assert "seeAlso" not in empty_canvas
+  assert (directory / "p2.json").exists()
+  assert not (directory / "p2-index.json").exists()
@@ -0,0 +1,43 @@
+import pathlib
+import subprocess
+import sys
+
+import pytest
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+ENTRY_POINTS = ["create_directory_annotations", "transform_directory_anotations"]
+# dependencies that must only be imported on the code paths that need them
+HEAVY_MODULES = ["iiif_prezi3", "requests", "tqdm", "numpy", "cv2", "PIL", "pikepdf"]
+# standard library modules imported by the entry points, used as the reference startup time
+BASELINE_IMPORTS = "argparse, logging, json, os, pathlib, math"
+# the entry points may take at most this factor of the reference startup time
+IMPORT_BUDGET_FACTOR = 2
+
+def _importtime(statement:str):
+  result = subprocess.run(
+    [sys.executable, "-X", "importtime", "-c", statement],
+    cwd=ROOT, capture_output=True, text=True, check=True)
+  imports = {}
+  for line in result.stderr.splitlines():
+    if not line.startswith("import time:") or "cumulative" in line:
+      continue
+    _, cumulative, name = line[len("import time:"):].split("|")
+    # nested imports are indented and already counted in the cumulative time of their parent
+    imports[name.rstrip()] = int(cumulative)
+  return imports
+
+def _total(imports):
+  return sum(cumulative for name, cumulative in imports.items() if not name.startswith("  "))
+
+@pytest.mark.parametrize("module", ENTRY_POINTS)
+def test_no_heavy_imports(module):
+  imports = _importtime(f"import {module}")
+  loaded = {name.strip().split(".")[0] for name in imports}
+  assert not loaded.intersection(HEAVY_MODULES)
+
+@pytest.mark.parametrize("module", ENTRY_POINTS)
+def test_import_budget(module):
+  # measured against the standard library imports in the same environment to avoid depending on the machine load
+  baseline = min(_total(_importtime(f"import {BASELINE_IMPORTS}")) for _ in range(3))
+  total = min(_total(_importtime(f"import {module}")) for _ in range(3))
+  assert total < IMPORT_BUDGET_FACTOR * baseline
@@ -2,21 +2,12 @@
 
 import logging
 import json
-from iiif_prezi3 import config
 import os
-import numpy as np
-import cv2
 import math
-from PIL import Image, TiffImagePlugin
-from pikepdf import Pdf, PdfImage
 import argparse
 import pathlib
-from tqdm import tqdm
-
-import requests
 
 logging.basicConfig(level=logging.INFO)
-TiffImagePlugin.DEBUG = False
 
 #TODO add scale parameter to skip detection (when it does not work as expected)?
 #TODO use named arguments instead of positional?
@@ -35,6 +26,7 @@ def _get_parser():
   return parser
 
 def get_shape(fname):
+  from PIL import Image
   img=Image.open(fname)
   return (img.size[0], img.size[1])
 
@@ -46,6 +38,11 @@ class InvalidViewIndexError(RuntimeError):
   pass
 # Adapted from directory-annotator-back
 def get_pdf_shape_and_angle(pdfname,view):
+  # image decoding dependencies are only needed when the angle is not given by a transform manifest
+  import numpy as np
+  from PIL import TiffImagePlugin
+  from pikepdf import Pdf, PdfImage
+  TiffImagePlugin.DEBUG = False
   try:
     pdf_file = Pdf.open(pdfname)
     num_pages = len(pdf_file.pages)
@@ -75,10 +72,12 @@ def transform(xy, angle):
 
 # Adapted from directory-annotator-back
 def is_vertical(angle, tolerance):
-  return np.abs(np.degrees(angle) - 90) < tolerance
+  return abs(math.degrees(angle) - 90) < tolerance
 
 # Adapted from directory-annotator-back
 def deskew_estimation(img, tolerance):
+  import numpy as np
+  import cv2
   # using the parameters from directory-annotator-back
   lsd = cv2.createLineSegmentDetector(scale = 0.5,sigma_scale=0.6,quant=2.0,ang_th=22.5,log_eps=2.0,density_th=0.7,n_bins=1024)
   lines, _, _,_ = lsd.detect(img)
@@ -111,8 +110,9 @@ def transform_directory_annotations(
     output_path:pathlib.Path, 
     input_transform_manifest_path:pathlib.Path, 
     output_transform_manifest_path:pathlib.Path):
+  import requests
+  from tqdm import tqdm
   os.makedirs(output_path, exist_ok=True)
-  config.configs['helpers.auto_fields.AutoLang'].auto_lang = "fr"
   #FIXME This is ugly: it uses the initial manifest instead of single info files to make less requests
   original_manifest_url = f"https://gallica.bnf.fr/iiif/{ark}/manifest.json"
   url_response = requests.get(original_manifest_url)
@@ -131,19 +131,19 @@ def transform_directory_annotations(
         if os.path.exists(input_transform_manifest_path):
           with open(os.path.join(input_transform_manifest_path, file_path.replace('.json','-manifest.json')), 'r') as file:
             data = json.load(file)
-            angle = np.radians(data["angle"])
+            angle = math.radians(data["angle"])
         else:
           res = get_pdf_shape_and_angle(pdf_file_name,view-1)#TODO check this view shift to make it more robust?
           if res:
             h2,w2,angle = res
           else:
-            h2,w2,angle = h1,w1,np.pi / 2#if no shape from pdf
+            h2,w2,angle = h1,w1,math.pi / 2#if no shape from pdf
         # the images were resized so that the width of the output was 2048 so we resize boxes to fit the iiif width instead
         ratio = w1 / 2048.0
         if output_transform_manifest_path:
           os.makedirs(output_transform_manifest_path, exist_ok=True)
           with open(os.path.join(output_transform_manifest_path, file_path), 'w') as output_file:
-            json.dump({"angle":np.degrees(angle),"ratio":ratio}, output_file, indent = 1)
+            json.dump({"angle":math.degrees(angle),"ratio":ratio}, output_file, indent = 1)
         #logging.debug(f"{pdf_file_name} view {view} has {h2} and {w2} whereas iiif has {h1} and {w1} => ratio = {ratio}")
         with open(os.path.join(directory_path, file_path)) as file:
           data = json.load(file)